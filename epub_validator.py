@@ -9,16 +9,32 @@ Last Updated: 2026-02-27
 See CHANGELOG.md for version history.
 """
 
+import io
+import mmap
 import os
+import posixpath
 import sys
 import zipfile
-import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
 from urllib.parse import unquote
 import re
 import struct
-from collections import defaultdict
+import zlib
+import bisect
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# lxml (libxml2) is faster and reports precise error locations; fall back to
+# the standard library parser when it is not installed
+try:
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
 
 
 class EPUBValidator:
@@ -27,22 +43,95 @@ class EPUBValidator:
     # Security limits
     MAX_UNCOMPRESSED_SIZE = 500 * 1024 * 1024  # 500MB
     MAX_COMPRESSION_RATIO = 100
+    # Memory limit for decoded text kept in the content cache
+    MAX_CACHED_TEXT_SIZE = 64 * 1024 * 1024  # 64M characters
+    # Worker threads used to decompress content files ahead of the checks
+    MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+    # Pre-built binary layouts for header parsing
+    STRUCT_PNG_SIZE = struct.Struct('>II')       # IHDR width, height
+    STRUCT_JPEG_SIZE = struct.Struct('>HH')      # SOF height, width
+    STRUCT_ZIP_NAME_EXTRA = struct.Struct('<HH')  # local header name/extra lengths
     
+    # Media types partitioned once by _index_manifest
+    XHTML_MEDIA_TYPES = frozenset(('application/xhtml+xml', 'text/html'))
+    AV_MEDIA_TYPES = frozenset(('audio/mpeg', 'audio/mp4', 'video/mp4', 'video/h264'))
+    IMAGE_MEDIA_TYPES = frozenset(('image/jpeg', 'image/png', 'image/gif', 'image/svg+xml', 'image/tiff'))
+    TIFF_EXTENSIONS = ('.tiff', '.tif')
+    FONT_MEDIA_TYPES = frozenset((
+        'application/vnd.ms-opentype',
+        'application/x-font-ttf',
+        'application/x-font-truetype',
+        'application/x-font-otf',
+        'font/ttf',
+        'font/otf',
+        'font/woff',
+        'font/woff2',
+    ))
+    FONT_EXTENSIONS = ('.ttf', '.otf', '.woff', '.woff2')
+    # Link targets outside the book (including protocol-relative URLs)
+    EXTERNAL_SCHEMES = ('http://', 'https://', 'mailto:', 'ftp://', 'data:', '//', 'javascript:', 'tel:')
+
     # Pre-compiled regex patterns for performance
-    RE_ID_ATTR = re.compile(r'\bid\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
-    RE_HREF_ATTR = re.compile(r'href\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+    # id and href are scanned together in one pass over the UTF-8 bytes (ASCII
+    # pattern, roughly 2x faster than str). The match starts on the last letter
+    # of the name (d/f), which is rare enough that the lookbehinds confirming
+    # "id"/"href" only run at candidate positions. The name must not continue a
+    # word or hyphenated name (data-id, data-href); xml:id and xlink:href still
+    # count. Group 1 is the d/f that tells the two apart; group 2 is the value,
+    # which may be empty so href="" is counted in the same pass.
+    RE_ID_HREF_ATTR = re.compile(
+        rb'([dDfF])(?<=[iI][dD]|[eE][fF])'
+        rb'(?:(?<=[dD])(?<![\w-]..)|(?<=[hH][rR][eE][fF])(?<![\w-]....))'
+        rb'\s*=\s*["\']([^"\']*)["\']'
+    )
     RE_SCRIPT_TAG = re.compile(r'<script[>\s]', re.IGNORECASE)
     RE_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
     RE_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
     RE_TRANSFORM = re.compile(r'(?<!text-)transform\s*:', re.IGNORECASE)
-    RE_LARGE_MARGIN = re.compile(r'margin[^:]*:\s*(\d+(?:\.\d+)?)(em|rem)', re.IGNORECASE)
-    RE_VIEWPORT_UNITS = re.compile(r'\d+vw|\d+vh|\d+vmin|\d+vmax')
+    # Common HTML entities that cause issues in XHTML: (entity, numeric replacement, name)
+    HTML_ENTITIES = (
+        ('&nbsp;', '&#160;', 'nbsp'),
+        ('&ndash;', '&#8211;', 'ndash'),
+        ('&mdash;', '&#8212;', 'mdash'),
+        ('&hellip;', '&#8230;', 'hellip'),
+        ('&rsquo;', '&#8217;', 'rsquo'),
+        ('&lsquo;', '&#8216;', 'lsquo'),
+        ('&rdquo;', '&#8221;', 'rdquo'),
+        ('&ldquo;', '&#8220;', 'ldquo'),
+        ('&copy;', '&#169;', 'copy'),
+        ('&reg;', '&#174;', 'reg'),
+        ('&trade;', '&#8482;', 'trade'),
+    )
+    # XHTML 1.x DTDs / entity sets that declare the named HTML entities
+    RE_ENTITY_DTD = re.compile(
+        r'xhtml1-strict\.dtd|xhtml1-transitional\.dtd|xhtml11\.dtd|'
+        r'xhtml-lat1\.ent|xhtml-special\.ent|xhtml-symbol\.ent'
+    )
+    RE_HTML_ENTITY = re.compile(r'&(nbsp|ndash|mdash|hellip|rsquo|lsquo|rdquo|ldquo|copy|reg|trade);')
+
+    # Layout hints in XHTML, fused into one alternation so the file is scanned once.
+    # The leading lookahead lists every branch's possible first character, so
+    # positions that cannot start a match are rejected before any branch is tried
+    RE_LAYOUT_HINTS = re.compile(
+        rb'(?=[pmMtT\d])(?:'
+        rb'(?P<absolute>position: ?absolute)'
+        rb'|(?P<fixed>position: ?fixed)'
+        # Margin consumes only the word; its value is read in a lookahead so that
+        # hints between 'margin' and the colon are still found by finditer
+        rb'|(?P<margin>(?i:margin)(?=[^:\n]*:[^\S\n]*(?P<value>\d+(?:\.\d+)?)(?P<unit>(?i:em|rem))))'
+        rb'|(?P<viewport>\d+(?:vw|vh|vmin|vmax))'
+        rb'|(?P<transform>(?i:(?<!text-)transform)[^\S\n]*:)'
+        rb')'
+    )
     RE_BCP47 = re.compile(r'^[a-zA-Z]{2,3}(-[a-zA-Z]{2,4})?(-[a-zA-Z]{4})?(-[a-zA-Z0-9]{2,8})*$')
+    RE_PLACEHOLDER = re.compile(r'^[A-Z_]{5,}$|^(YOUR|TODO|FIXME|INSERT|PLACEHOLDER|CHANGE)', re.IGNORECASE)
+    RE_CSS_BARE_ELEMENT = re.compile(r'(?:^|[,\s>+~])([a-zA-Z][a-zA-Z0-9]*)(?=\s*[{,.#:\[>+~ ]|$)')
 
     # KDP-specific pre-compiled patterns
     RE_FORM_ELEMENTS = re.compile(r'<(form|input|canvas|iframe)[\s>]', re.IGNORECASE)
     RE_AUDIO_VIDEO_HTML = re.compile(r'<(audio|video)[\s>]', re.IGNORECASE)
-    RE_BASE64_IMAGE = re.compile(r'src\s*=\s*["\']data:image/', re.IGNORECASE)
+    RE_BASE64_IMAGE = re.compile(rb'src\s*=\s*["\']data:image/', re.IGNORECASE)
     RE_IMG_ALT = re.compile(r'<img\s[^>]*?/?>', re.IGNORECASE | re.DOTALL)
     RE_CSS_FONT_SIZE_FIXED = re.compile(r'font-size\s*:\s*\d+(?:\.\d+)?\s*(?:px|pt)\b', re.IGNORECASE)
     RE_CSS_NEGATIVE_MARGIN = re.compile(r'margin[^:]*:\s*[^;]*-\d', re.IGNORECASE)
@@ -52,13 +141,34 @@ class EPUBValidator:
     RE_CSS_LINEAR_GRADIENT = re.compile(r'linear-gradient\s*\(', re.IGNORECASE)
     RE_CSS_CAPTION_SIDE = re.compile(r'caption-side\s*:\s*bottom', re.IGNORECASE)
     RE_CSS_BODY_FONT_OVERRIDE = re.compile(r'body\s*\{[^}]*font-family\s*:', re.IGNORECASE | re.DOTALL)
+    RE_TOC_PAGE_NUMBER = re.compile(r'>\s*.*?\.\s*\.\s*\.\s*\d+\s*<|>\s*page\s+\d+\s*<', re.IGNORECASE)
+    RE_TABLE_CELL_FLOAT = re.compile(rb'<t[dh][^>]*style=[^>]*float\s*:', re.IGNORECASE)
     RE_NBSP_EXCESSIVE = re.compile(r'(?:&nbsp;|&#160;)\s*(?:&nbsp;|&#160;)\s*(?:&nbsp;|&#160;)', re.IGNORECASE)
-    RE_LANG_ATTR = re.compile(r'\blang\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
-    RE_HTML_ROOT_LANG = re.compile(r'<html[^>]*\bxml:lang\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+    RE_LANG_ATTR = re.compile(rb'\blang\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+    RE_HTML_ROOT_LANG = re.compile(rb'<html[^>]*\bxml:lang\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+    RE_XML_DECL_ENCODING = re.compile(r'^(<\?xml[^>]*?\bencoding\s*=\s*["\'])[^"\']*')
     RE_CSS_COLOR_FORCE = re.compile(r'(?<![a-zA-Z-])color\s*:\s*(?:#[0-9a-fA-F]{3,6}|rgb)', re.IGNORECASE)
     RE_CSS_BODY_BOLD = re.compile(r'body\s*\{[^}]*font-weight\s*:\s*bold', re.IGNORECASE | re.DOTALL)
     RE_CSS_BODY_ITALIC = re.compile(r'body\s*\{[^}]*font-style\s*:\s*italic', re.IGNORECASE | re.DOTALL)
 
+    # HTML element names accepted as bare CSS type selectors
+    VALID_HTML_ELEMENTS = frozenset({
+        'a', 'abbr', 'address', 'area', 'article', 'aside', 'audio',
+        'b', 'base', 'bdi', 'bdo', 'blockquote', 'body', 'br', 'button',
+        'canvas', 'caption', 'cite', 'code', 'col', 'colgroup',
+        'data', 'datalist', 'dd', 'del', 'details', 'dfn', 'dialog', 'div', 'dl', 'dt',
+        'em', 'embed', 'fieldset', 'figcaption', 'figure', 'footer', 'form',
+        'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'head', 'header', 'hgroup', 'hr', 'html',
+        'i', 'iframe', 'img', 'input', 'ins', 'kbd',
+        'label', 'legend', 'li', 'link', 'main', 'map', 'mark', 'math', 'menu', 'meta',
+        'meter', 'nav', 'noscript', 'object', 'ol', 'optgroup', 'option', 'output',
+        'p', 'param', 'picture', 'pre', 'progress', 'q',
+        'rp', 'rt', 'ruby', 's', 'samp', 'script', 'search', 'section', 'select', 'slot',
+        'small', 'source', 'span', 'strong', 'style', 'sub', 'summary', 'sup', 'svg',
+        'table', 'tbody', 'td', 'template', 'textarea', 'tfoot', 'th', 'thead',
+        'time', 'title', 'tr', 'track', 'u', 'ul', 'var', 'video', 'wbr',
+    })
+
     # Namespaces commonly used in EPUB
     NAMESPACES = {
         'opf': 'http://www.idpf.org/2007/opf',
@@ -68,6 +178,10 @@ class EPUBValidator:
         'epub': 'http://www.idpf.org/2007/ops',
         'container': 'urn:oasis:names:tc:opendocument:xmlns:container'
     }
+
+    # Clark-notation tags for direct child comparison in manifest/spine
+    OPF_ITEM = '{http://www.idpf.org/2007/opf}item'
+    OPF_ITEMREF = '{http://www.idpf.org/2007/opf}itemref'
     
     def __init__(self, epub_path: str):
         self.epub_path = Path(epub_path)
@@ -102,6 +216,26 @@ class EPUBValidator:
         }
         # Cache for file contents to avoid redundant reads
         self._content_cache: Dict[str, str] = {}
+        self._content_cache_size = 0
+        # Manifest lookup indexes, built once by _parse_manifest
+        self._by_media_type: Dict[str, List[Dict]] = defaultdict(list)
+        self._by_property: Dict[str, List[Dict]] = defaultdict(list)
+        self._xhtml_items: List[Dict] = []  # content documents, in manifest order
+        self._av_items: List[Dict] = []  # audio/video, in manifest order
+        self._image_items: List[Dict] = []  # images (TIFF also by extension), in manifest order
+        self._font_items: List[Dict] = []  # fonts by media type or extension, in manifest order
+        # id/href attribute values per content document, built by _scan_xhtml_attrs
+        self._xhtml_attrs: Optional[List[Tuple[str, List[str], List[str], int]]] = None
+        # Reusable lxml parser (entity expansion disabled for untrusted input);
+        # ElementTree parsers cannot be reused, so None means "new one per call"
+        self._xml_parser = (
+            ET.XMLParser(resolve_entities=False, huge_tree=True, collect_ids=False)
+            if HAS_LXML else None
+        )
+        # Read-only map of the archive while validate() runs (None if unavailable)
+        self._archive_map: Optional[mmap.mmap] = None
+        # OPF <meta> elements, collected once by _extract_metadata for the platform checks
+        self._opf_metas: List[ET.Element] = []
     
     def _is_safe_path(self, path: str) -> bool:
         """Check if path is safe (no directory traversal)"""
@@ -110,8 +244,12 @@ class EPUBValidator:
     
     def _check_zip_safety(self, epub: zipfile.ZipFile) -> bool:
         """Check for potential zip bombs"""
-        total_uncompressed = sum(f.file_size for f in epub.infolist())
-        total_compressed = sum(f.compress_size for f in epub.infolist())
+        # One walk over the cached central directory for both totals
+        total_uncompressed = 0
+        total_compressed = 0
+        for info in epub.infolist():
+            total_uncompressed += info.file_size
+            total_compressed += info.compress_size
         
         if total_uncompressed > self.MAX_UNCOMPRESSED_SIZE:
             self.issues['general'].append(
@@ -139,14 +277,170 @@ class EPUBValidator:
             return None
         
         try:
-            content = epub.read(path).decode('utf-8', errors='ignore')
-            self._content_cache[path] = content
-            return content
+            content = self._read_zip_text(epub, path)
         except KeyError:
             return None
         except (IOError, UnicodeDecodeError) as e:
             self.warnings['general'].append(f"Error reading '{path}': {str(e)}")
             return None
+        self._cache_content(path, content)
+        return content
+
+    def _cache_content(self, path: str, content: str):
+        """Cache decoded content until the budget is spent; beyond that, re-read on demand"""
+        if self._content_cache_size + len(content) <= self.MAX_CACHED_TEXT_SIZE:
+            self._content_cache[path] = content
+            self._content_cache_size += len(content)
+
+    def _iter_files_cached(self, epub: zipfile.ZipFile, paths: List[str]):
+        """Yield (path, content) as _read_file_cached would, decompressing ahead on worker threads
+
+        ZipFile objects are not thread-safe, so each worker opens its own handle.
+        Only a small window of files is read ahead to keep memory bounded.
+        """
+        local = threading.local()
+        handles = []
+
+        def read(path):
+            worker_epub = getattr(local, 'epub', None)
+            if worker_epub is None:
+                worker_epub = local.epub = zipfile.ZipFile(self.epub_path, 'r')
+                handles.append(worker_epub)
+            return self._read_zip_text(worker_epub, path)
+
+        pending = deque()
+        remaining = iter(paths)
+        pool = ThreadPoolExecutor(max_workers=self.MAX_WORKERS)
+        try:
+            while True:
+                while len(pending) < self.MAX_WORKERS * 2:
+                    path = next(remaining, None)
+                    if path is None:
+                        break
+                    # Cached and unsafe paths go through the normal reader
+                    if path in self._content_cache or not self._is_safe_path(path):
+                        pending.append((path, None))
+                    else:
+                        pending.append((path, pool.submit(read, path)))
+                if not pending:
+                    break
+
+                path, future = pending.popleft()
+                if future is None:
+                    yield path, self._read_file_cached(epub, path)
+                    continue
+                try:
+                    content = future.result()
+                except KeyError:
+                    yield path, None
+                    continue
+                except (IOError, UnicodeDecodeError) as e:
+                    self.warnings['general'].append(f"Error reading '{path}': {str(e)}")
+                    yield path, None
+                    continue
+                self._cache_content(path, content)
+                yield path, content
+        finally:
+            for _, future in pending:
+                if future is not None:
+                    future.cancel()
+            pool.shutdown(wait=True)
+            for handle in handles:
+                handle.close()
+
+    def _decode_text(self, data) -> str:
+        """Decode a text file (bytes or memoryview) as UTF-8, transcoding UTF-16 (detected by its BOM) once"""
+        if data[:2] in (b'\xff\xfe', b'\xfe\xff'):
+            content = str(data, 'utf-16', 'ignore')
+            # Content is re-encoded as UTF-8 for parsing, so the declaration must say so
+            return self.RE_XML_DECL_ENCODING.sub(r'\g<1>utf-8', content, count=1)
+        return str(data, 'utf-8', 'ignore')
+
+    @contextmanager
+    def _map_archive(self, epub: zipfile.ZipFile):
+        """Memory-map the open archive so stored entries are read without file I/O calls"""
+        try:
+            archive_map = mmap.mmap(epub.fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            archive_map = None  # e.g. file systems without mmap support
+        self._archive_map = archive_map
+        try:
+            yield
+        finally:
+            self._archive_map = None
+            if archive_map is not None:
+                archive_map.close()
+
+    def _stored_data_offset(self, epub: zipfile.ZipFile, info: zipfile.ZipInfo) -> Optional[int]:
+        """Archive offset of an unencrypted stored entry's data, or None to defer to zipfile
+
+        Read from the local header (its extra field may differ from the central
+        directory's). Without the archive map this seeks the handle's file, so
+        each ZipFile handle must only be used from one thread.
+        """
+        if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+            return None
+        if self._archive_map is not None:
+            header = self._archive_map[info.header_offset:info.header_offset + 30]
+        else:
+            epub.fp.seek(info.header_offset)
+            header = epub.fp.read(30)
+        if len(header) < 30 or header[:4] != b'PK\x03\x04':
+            return None  # Unexpected layout - let zipfile report it
+        name_len, extra_len = self.STRUCT_ZIP_NAME_EXTRA.unpack_from(header, 26)
+        return info.header_offset + 30 + name_len + extra_len
+
+    @staticmethod
+    def _check_stored_data(data, size: int, info: zipfile.ZipInfo, path: str):
+        """Raise BadZipFile if stored entry data is truncated or (when read whole) fails CRC-32"""
+        if len(data) < size:
+            raise zipfile.BadZipFile(f"Truncated file {path!r}")
+        if size == info.file_size and zlib.crc32(data) & 0xffffffff != info.CRC:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for file {path!r}")
+
+    def _read_zip(self, epub: zipfile.ZipFile, path: str, max_bytes: Optional[int] = None) -> bytes:
+        """Read a ZIP entry (or its first max_bytes), bypassing the decompressor for stored entries"""
+        info = epub.getinfo(path)
+        start = self._stored_data_offset(epub, info)
+        if start is not None:
+            size = info.file_size if max_bytes is None else min(max_bytes, info.file_size)
+            if self._archive_map is not None:
+                data = self._archive_map[start:start + size]
+            else:
+                epub.fp.seek(start)
+                data = epub.fp.read(size)
+            self._check_stored_data(data, size, info, path)
+            return data
+        with epub.open(info) as f:
+            return f.read() if max_bytes is None else f.read(max_bytes)
+
+    def _read_zip_text(self, epub: zipfile.ZipFile, path: str) -> str:
+        """Read and decode a text entry; stored entries are decoded straight from the archive map"""
+        info = epub.getinfo(path)
+        start = self._stored_data_offset(epub, info) if self._archive_map is not None else None
+        if start is None:
+            return self._decode_text(self._read_zip(epub, path))
+        # Views must be released before the map is closed
+        with memoryview(self._archive_map) as whole, whole[start:start + info.file_size] as data:
+            self._check_stored_data(data, info.file_size, info, path)
+            return self._decode_text(data)
+
+    @staticmethod
+    def _newline_offsets(content) -> List[int]:
+        """Offsets of every newline in str or bytes, for mapping match positions to line numbers with bisect"""
+        newline = b'\n' if isinstance(content, bytes) else '\n'
+        return [m.start() for m in re.finditer(newline, content)]
+
+    def _parse_xml(self, data: bytes):
+        """Parse XML bytes, letting the parser honour the encoding declaration"""
+        return ET.fromstring(data, self._xml_parser)
+
+    def _iterparse(self, data: bytes):
+        """Stream-parse XML bytes, yielding (event, element) on each closing tag"""
+        source = io.BytesIO(data)
+        if HAS_LXML:
+            return ET.iterparse(source, events=('end',), resolve_entities=False, huge_tree=True)
+        return ET.iterparse(source, events=('end',))
         
     def validate(self) -> Optional[Dict]:
         """Run all validation checks"""
@@ -159,7 +453,7 @@ class EPUBValidator:
             return None
         
         try:
-            with zipfile.ZipFile(self.epub_path, 'r') as epub:
+            with zipfile.ZipFile(self.epub_path, 'r') as epub, self._map_archive(epub):
                 # Security check first
                 if not self._check_zip_safety(epub):
                     return self._generate_report()
@@ -175,8 +469,7 @@ class EPUBValidator:
                     return self._generate_report()
                 
                 # Parse OPF
-                opf_content = epub.read(opf_path).decode('utf-8')
-                opf_root = ET.fromstring(opf_content)
+                opf_root = self._parse_xml(self._read_zip(epub, opf_path))
                 
                 # Extract metadata
                 self._extract_metadata(opf_root)
@@ -186,7 +479,7 @@ class EPUBValidator:
                 spine = self._parse_spine(opf_root)
                 
                 # File statistics
-                self.info['file_count'] = len(epub.namelist())
+                self.info['file_count'] = len(epub.infolist())
                 
                 # Content validation
                 self._validate_content_files(epub, manifest)
@@ -227,9 +520,10 @@ class EPUBValidator:
     def _check_mimetype(self, epub: zipfile.ZipFile):
         """Check mimetype file exists, is correct, and is uncompressed"""
         try:
-            # Check content
-            mimetype = epub.read('mimetype').decode('utf-8').strip()
-            if mimetype != 'application/epub+zip':
+            # Check content (compared as bytes; only decoded for the message)
+            mimetype = self._read_zip(epub, 'mimetype').strip()
+            if mimetype != b'application/epub+zip':
+                mimetype = mimetype.decode('utf-8', errors='replace')
                 self.issues['general'].append(
                     f"Invalid mimetype: '{mimetype}' (should be 'application/epub+zip')"
                 )
@@ -242,7 +536,7 @@ class EPUBValidator:
                 )
             
             # Check if it's the first file (optional but recommended)
-            if epub.namelist()[0] != 'mimetype':
+            if epub.infolist()[0].filename != 'mimetype':
                 self.warnings['general'].append(
                     "Mimetype is not first file in ZIP (EPUB OCF 3.0 § 3.3 recommends first)"
                 )
@@ -252,15 +546,14 @@ class EPUBValidator:
     def _check_container(self, epub: zipfile.ZipFile):
         """Check META-INF/container.xml exists"""
         try:
-            epub.read('META-INF/container.xml')
+            epub.getinfo('META-INF/container.xml')
         except KeyError:
             self.issues['general'].append("Missing 'META-INF/container.xml' file")
     
     def _get_opf_path(self, epub: zipfile.ZipFile) -> Optional[str]:
         """Get the path to the OPF file from container.xml"""
         try:
-            container_xml = epub.read('META-INF/container.xml').decode('utf-8')
-            container_root = ET.fromstring(container_xml)
+            container_root = self._parse_xml(self._read_zip(epub, 'META-INF/container.xml'))
             
             rootfile = container_root.find('.//container:rootfile', self.NAMESPACES)
             if rootfile is not None:
@@ -274,6 +567,8 @@ class EPUBValidator:
         """Extract basic metadata from OPF"""
         metadata = opf_root.find('.//opf:metadata', self.NAMESPACES)
         if metadata is not None:
+            self._opf_metas = metadata.findall('.//opf:meta', self.NAMESPACES)
+
             # Title
             title = metadata.find('.//dc:title', self.NAMESPACES)
             if title is not None and title.text:
@@ -321,12 +616,11 @@ class EPUBValidator:
                 self.info['identifier'] = identifier.text.strip()
 
             # Check for placeholder metadata values
-            placeholder_re = re.compile(r'^[A-Z_]{5,}$|^(YOUR|TODO|FIXME|INSERT|PLACEHOLDER|CHANGE)', re.IGNORECASE)
             for tag_name in ['dc:source', 'dc:identifier', 'dc:publisher', 'dc:rights']:
                 for elem in metadata.findall(f'.//{tag_name}', self.NAMESPACES):
                     if elem.text and elem.text.strip():
                         text = elem.text.strip()
-                        if placeholder_re.search(text):
+                        if self.RE_PLACEHOLDER.search(text):
                             self.warnings['general'].append(
                                 f"Possible placeholder in {tag_name}: '{text}' - replace with actual value before publishing"
                             )
@@ -342,8 +636,10 @@ class EPUBValidator:
         manifest_elem = opf_root.find('.//opf:manifest', self.NAMESPACES)
         
         if manifest_elem is not None:
-            opf_dir = str(Path(opf_path).parent)
-            for item in manifest_elem.findall('.//opf:item', self.NAMESPACES):
+            opf_dir = posixpath.dirname(opf_path)
+            for item in manifest_elem:
+                if item.tag != self.OPF_ITEM:
+                    continue
                 item_id = item.get('id')
                 href = item.get('href')
                 media_type = item.get('media-type')
@@ -354,27 +650,56 @@ class EPUBValidator:
                     # but ZIP entry names use decoded filenames)
                     decoded_href = unquote(href)
 
-                    # Resolve path relative to OPF
-                    if opf_dir and opf_dir != '.':
-                        full_path = str(Path(opf_dir) / decoded_href)
-                    else:
-                        full_path = decoded_href
+                    # Resolve path relative to OPF; interned once, since the same
+                    # href keys the indexes, the content cache and link lookups
+                    full_path = sys.intern(self._join_zip_path(opf_dir, decoded_href))
                     
                     manifest[item_id] = {
                         'href': full_path,
                         'media_type': media_type,
-                        'properties': properties
+                        'properties': properties,
+                        # Whitespace-separated tokens per spec; test membership, not substrings
+                        'properties_set': frozenset(properties.split()) if properties else frozenset()
                     }
         
+        self._index_manifest(manifest)
         return manifest
     
+    def _index_manifest(self, manifest: Dict):
+        """Build the manifest lookup indexes (duplicate ids keep the last declaration)"""
+        for item_info in manifest.values():
+            media_type = item_info['media_type']
+            self._by_media_type[media_type].append(item_info)
+            if media_type in self.XHTML_MEDIA_TYPES:
+                self._xhtml_items.append(item_info)
+            elif media_type in self.AV_MEDIA_TYPES:
+                self._av_items.append(item_info)
+            href_lower = item_info['href'].lower()
+            if media_type in self.IMAGE_MEDIA_TYPES or href_lower.endswith(self.TIFF_EXTENSIONS):
+                self._image_items.append(item_info)
+            if media_type in self.FONT_MEDIA_TYPES or href_lower.endswith(self.FONT_EXTENSIONS):
+                self._font_items.append(item_info)
+            for prop in item_info['properties_set']:
+                self._by_property[prop].append(item_info)
+    
+    @staticmethod
+    def _join_zip_path(base_dir: str, href: str) -> str:
+        """Resolve an href against a directory inside the ZIP (entry names are always POSIX)"""
+        path = posixpath.join(base_dir, href)
+        # Only pay for normalization when there is something to normalize
+        if '//' in path or '/.' in path or path.startswith('.') or path.endswith('/'):
+            path = posixpath.normpath(path)
+        return path
+    
     def _parse_spine(self, opf_root: ET.Element) -> List[Dict]:
         """Parse spine to get reading order"""
         spine = []
         spine_elem = opf_root.find('.//opf:spine', self.NAMESPACES)
         
         if spine_elem is not None:
-            for itemref in spine_elem.findall('.//opf:itemref', self.NAMESPACES):
+            for itemref in spine_elem:
+                if itemref.tag != self.OPF_ITEMREF:
+                    continue
                 idref = itemref.get('idref')
                 linear = itemref.get('linear', 'yes')  # Default per spec
                 
@@ -390,176 +715,212 @@ class EPUBValidator:
     
     def _validate_content_files(self, epub: zipfile.ZipFile, manifest: Dict):
         """Validate XHTML/HTML content files"""
-        xhtml_count = 0
+        xhtml_hrefs = [item_info['href'] for item_info in self._xhtml_items]
+        xhtml_count = len(xhtml_hrefs)
         
-        for item_id, item_info in manifest.items():
-            media_type = item_info['media_type']
-            href = item_info['href']
+        # Files are decompressed in parallel; checks run here in manifest order
+        for href, content in self._iter_files_cached(epub, xhtml_hrefs):
+            if content is None:
+                self.issues['general'].append(f"Referenced file not found: '{href}'")
+                continue
             
-            if media_type in ['application/xhtml+xml', 'text/html']:
-                xhtml_count += 1
-                
-                content = self._read_file_cached(epub, href)
-                if content is None:
-                    self.issues['general'].append(f"Referenced file not found: '{href}'")
-                    continue
-                
-                # Check for HTML entities without proper declaration
-                self._check_html_entities(content, href)
-                
-                # Check for XML/XHTML validity issues
-                self._check_xhtml_validity(content, href)
-                
-                # Check for common issues using pre-compiled patterns
-                content_no_comments = self.RE_COMMENT.sub('', content)
-                if self.RE_SCRIPT_TAG.search(content_no_comments):
-                    self.warnings['general'].append(
-                        f"JavaScript found in '{href}' (limited support on e-readers)"
-                    )
-                
-                # Check for embedded styles (warning for Kindle)
-                # Only warn if extensive inline styles (avoid noise on minimal usage)
+            # Encoded once: the parse and the bytes-pattern scans below share it
+            raw = content.encode('utf-8')
+
+            # Check for HTML entities without proper declaration
+            self._check_html_entities(content, href)
+            
+            # Single streaming parse: XML validity + inline style count
+            inline_style_count = self._scan_xhtml_tree(raw, content, href)
+            
+            # Check for common issues using pre-compiled patterns
+            content_no_comments = self.RE_COMMENT.sub('', content)
+            if self.RE_SCRIPT_TAG.search(content_no_comments):
+                self.warnings['general'].append(
+                    f"JavaScript found in '{href}' (limited support on e-readers)"
+                )
+            
+            # Check for embedded styles (warning for Kindle)
+            # Only warn if extensive inline styles (avoid noise on minimal usage)
+            if inline_style_count is None:
+                # Malformed document - parse stopped early, count raw text instead
                 inline_style_count = content.count('style=')
-                if inline_style_count > 10:  # Threshold for concern
-                    self.warnings['kindle'].append(
-                        f"Extensive inline styles ({inline_style_count} instances) in '{href}' "
-                        f"may not render correctly on older Kindles - consider moving to CSS"
-                    )
-                
-                # Check for layout issues
-                self._check_layout_issues(content, href)
+            if inline_style_count > 10:  # Threshold for concern
+                self.warnings['kindle'].append(
+                    f"Extensive inline styles ({inline_style_count} instances) in '{href}' "
+                    f"may not render correctly on older Kindles - consider moving to CSS"
+                )
+            
+            # Check for layout issues
+            self._check_layout_issues(raw, href)
 
-                # Check for language attribute mismatches
-                self._check_language_attrs(content, href)
+            # Check for language attribute mismatches
+            self._check_language_attrs(raw, href)
 
         if xhtml_count == 0:
             self.issues['general'].append("No content files found in manifest")
     
     def _check_html_entities(self, content: str, file_path: str):
         """Check for HTML entities that need proper declaration for Apple Books"""
-        # Common HTML entities that cause issues in XHTML
-        problematic_entities = [
-            ('&nbsp;', '&#160;', 'nbsp'),
-            ('&ndash;', '&#8211;', 'ndash'),
-            ('&mdash;', '&#8212;', 'mdash'),
-            ('&hellip;', '&#8230;', 'hellip'),
-            ('&rsquo;', '&#8217;', 'rsquo'),
-            ('&lsquo;', '&#8216;', 'lsquo'),
-            ('&rdquo;', '&#8221;', 'rdquo'),
-            ('&ldquo;', '&#8220;', 'ldquo'),
-            ('&copy;', '&#169;', 'copy'),
-            ('&reg;', '&#174;', 'reg'),
-            ('&trade;', '&#8482;', 'trade'),
-        ]
-        
-        # Track entities we've already reported for this file to avoid duplicates
-        reported_entities = set()
-        
-        lines = content.split('\n')
-        for line_num, line in enumerate(lines, 1):
-            for entity, numeric_entity, entity_name in problematic_entities:
-                if entity in line and entity_name not in reported_entities:
-                    # Check if DOCTYPE declares HTML entities (more precise)
-                    has_entity_dtd = False
-                    if '<!DOCTYPE' in content:
-                        # Check for XHTML 1.x DTD that includes entity declarations
-                        if any(dtd in content for dtd in [
-                            'xhtml1-strict.dtd',
-                            'xhtml1-transitional.dtd', 
-                            'xhtml11.dtd',
-                            'xhtml-lat1.ent',
-                            'xhtml-special.ent',
-                            'xhtml-symbol.ent'
-                        ]):
-                            has_entity_dtd = True
-                    
-                    if not has_entity_dtd:
-                        reported_entities.add(entity_name)
-                        self.issues['apple_books'].append(
-                            f"{file_path} (line {line_num}): Undeclared entity '{entity_name}' - "
-                            f"Replace {entity} with {numeric_entity} or add proper DOCTYPE"
-                        )
-                        # Note: Don't duplicate in general issues - it's already covered in Apple Books
+        # Check once per file if DOCTYPE declares HTML entities (more precise):
+        # an XHTML 1.x DTD includes the entity declarations
+        if '<!DOCTYPE' in content and self.RE_ENTITY_DTD.search(content):
+            return
+
+        # One regex pass over the whole file; remember where each entity first appears
+        first_seen: Dict[str, int] = {}
+        for match in self.RE_HTML_ENTITY.finditer(content):
+            entity_name = match.group(1)
+            if entity_name not in first_seen:
+                first_seen[entity_name] = match.start()
+                if len(first_seen) == len(self.HTML_ENTITIES):
+                    break
+        if not first_seen:
+            return
+
+        newlines = self._newline_offsets(content)
+        found = []
+        for order, (entity, numeric_entity, entity_name) in enumerate(self.HTML_ENTITIES):
+            if entity_name in first_seen:
+                line_num = bisect.bisect_left(newlines, first_seen[entity_name]) + 1
+                found.append((line_num, order, entity, numeric_entity, entity_name))
+
+        # Report each entity once per file, ordered by line as before
+        apple_issues = self.issues['apple_books']
+        for line_num, _, entity, numeric_entity, entity_name in sorted(found):
+            apple_issues.append(
+                f"{file_path} (line {line_num}): Undeclared entity '{entity_name}' - "
+                f"Replace {entity} with {numeric_entity} or add proper DOCTYPE"
+            )
+            # Note: Don't duplicate in general issues - it's already covered in Apple Books
     
-    def _check_xhtml_validity(self, content: str, file_path: str):
-        """Check if XHTML is valid XML"""
+    def _scan_xhtml_tree(self, raw: bytes, content: str, file_path: str) -> Optional[int]:
+        """Parse XHTML in a single streaming pass, reporting XML errors
+
+        raw is the UTF-8 encoding of content, which is only used to quote the
+        offending line of an error. Returns the number of elements with an
+        inline style attribute, or None if the document is not well-formed
+        (parsing stops at the first error).
+        """
+        style_count = 0
+        context = self._iterparse(raw)
         try:
-            # Attempt to parse the XML
-            # We wrap content in a dummy root to handle potential multiple root issues in fragments
-            # though valid XHTML should have one html root.
-            ET.fromstring(content.encode('utf-8'))
+            for _, elem in context:
+                if 'style' in elem.attrib:
+                    style_count += 1
+                # Free processed elements so memory stays flat on large files
+                elem.clear()
+                if HAS_LXML:
+                    parent = elem.getparent()
+                    if parent is not None:
+                        while elem.getprevious() is not None:
+                            del parent[0]
         except ET.ParseError as e:
-            # This is crucial: Report the specific XML error
-            # Extract the specific line for context
-            lines = content.splitlines()
-            context = ""
-            line_num = "Unknown"
-            try:
-                line_num, col = e.position
-                if 0 <= line_num - 1 < len(lines):
-                    context = lines[line_num - 1].strip()
-            except (AttributeError, TypeError):
-                # Some older python versions might not have position attribute easily accessible or different error structure
-                context = "Unknown context"
-
-            # Check if this is an entity error (already reported by _check_html_entities)
-            # Don't duplicate the error message
-            if "undefined entity" in str(e).lower():
-                # Entity errors are already detailed in _check_html_entities
-                # Only add a note about XML validity impact
-                pass  # Skip - already reported with better context
-            else:
-                # Report other XML parsing errors
-                msg = f"XML Parsing Error: {str(e)}"
-                self.issues['general'].append(
-                    f"{file_path} (line {line_num}): {msg}"
-                )
+            # Both lxml and ElementTree errors carry (line, column) in .position
+            line_num = e.position[0] if getattr(e, 'position', None) else "Unknown"
+            message = e.msg or str(e)
+            if HAS_LXML:
+                # iterparse may raise a generic final error; the parser's own
+                # log holds the first (root cause) error with its line number
+                errors = context.error_log.filter_from_errors()
+                if errors:
+                    line_num, message = errors[0].line, errors[0].message
+            self._report_xml_error(line_num, message, file_path, content)
+            return None
+        return style_count
+
+    def _report_xml_error(self, line_num, message: str, file_path: str, content: str = ''):
+        """Report an XML well-formedness error found while parsing XHTML"""
+        # Entity errors are already reported with better context by
+        # _check_html_entities - don't duplicate them here
+        # (expat: "undefined entity", libxml2: "Entity 'x' not defined")
+        lowered = message.lower()
+        if "undefined entity" in lowered or ("entity" in lowered and "not defined" in lowered):
+            return
+
+        # Quote the offending source line for context when the parser gave one
+        context = self._line_at(content, line_num) if isinstance(line_num, int) else ''
+        if context:
+            context = f" - near: {context[:50]}{'...' if len(context) > 50 else ''}"
+        self.issues['general'].append(
+            f"{file_path} (line {line_num}): XML Parsing Error: {message.strip()}{context}"
+        )
+
+    @staticmethod
+    def _line_at(content: str, line_num: int) -> str:
+        """Return the stripped text of a 1-based line without splitting the whole file"""
+        if line_num < 1:
+            return ''
+        start = 0
+        for _ in range(line_num - 1):
+            start = content.find('\n', start) + 1
+            if start == 0:
+                return ''
+        end = content.find('\n', start)
+        return content[start:end if end >= 0 else len(content)].strip()
     
-    def _check_layout_issues(self, content: str, file_path: str):
+    def _check_layout_issues(self, content: bytes, file_path: str):
         """Check for potential layout issues on PocketBook and other readers"""
-        lines = content.split('\n')
-        
-        for line_num, line in enumerate(lines, 1):
+        # Single regex pass over the whole file; hits are grouped per line so
+        # each kind of problem is still reported at most once per line
+        hits: Dict[int, Dict[str, re.Match]] = {}
+        newlines = None
+        for match in self.RE_LAYOUT_HINTS.finditer(content):
+            kind = match.lastgroup
+            # Large margins (especially in em units) cause text layout to become mixed/unreadable
+            if kind == 'margin' and float(match.group('value')) < 5:  # 5em or more is problematic
+                continue
+            if newlines is None:
+                # Built lazily - most prose files have no hits at all
+                newlines = self._newline_offsets(content)
+            line_num = bisect.bisect_left(newlines, match.start()) + 1
+            hits.setdefault(line_num, {}).setdefault(kind, match)
+
+        if not hits:
+            return
+
+        # Bind the target lists once; this loop can emit thousands of entries
+        pb_warnings = self.warnings['pocketbook']
+        pb_issues = self.issues['pocketbook']
+        ib_issues = self.issues['inkbook']
+        for line_num, line_hits in sorted(hits.items()):
             # Check for absolute positioning
-            if 'position:absolute' in line or 'position: absolute' in line:
-                self.warnings['pocketbook'].append(
+            if 'absolute' in line_hits:
+                pb_warnings.append(
                     f"{file_path} (line {line_num}): Absolute positioning may cause layout issues"
                 )
             
             # Check for fixed positioning
-            if 'position:fixed' in line or 'position: fixed' in line:
-                self.warnings['pocketbook'].append(
+            if 'fixed' in line_hits:
+                pb_warnings.append(
                     f"{file_path} (line {line_num}): Fixed positioning not supported"
                 )
             
             # Check for large margin values in inline styles (CRITICAL for PocketBook)
-            # Large margins (especially in em units) cause text layout to become mixed/unreadable
-            large_margin_match = self.RE_LARGE_MARGIN.search(line)
-            if large_margin_match:
-                value = float(large_margin_match.group(1))
-                unit = large_margin_match.group(2)
-                if value >= 5:  # 5em or more is problematic
-                    self.issues['pocketbook'].append(
-                        f"{file_path} (line {line_num}): Large margin value ({value}{unit}) breaks text layout on PocketBook - "
-                        f"causes mixed/unreadable pages. Use smaller values (max 2em) or move to CSS file"
-                    )
-                    self.issues['inkbook'].append(
-                        f"{file_path} (line {line_num}): Large margin value ({value}{unit}) may break layout on InkBook"
-                    )
+            if 'margin' in line_hits:
+                value = float(line_hits['margin'].group('value'))
+                unit = line_hits['margin'].group('unit').decode()
+                pb_issues.append(
+                    f"{file_path} (line {line_num}): Large margin value ({value}{unit}) breaks text layout on PocketBook - "
+                    f"causes mixed/unreadable pages. Use smaller values (max 2em) or move to CSS file"
+                )
+                ib_issues.append(
+                    f"{file_path} (line {line_num}): Large margin value ({value}{unit}) may break layout on InkBook"
+                )
             
             # Check for viewport units
-            if self.RE_VIEWPORT_UNITS.search(line):
-                self.warnings['pocketbook'].append(
+            if 'viewport' in line_hits:
+                pb_warnings.append(
                     f"{file_path} (line {line_num}): Viewport units may not work correctly"
                 )
             
-            # Check for transforms (using pre-compiled pattern)
-            if self.RE_TRANSFORM.search(line):
-                self.warnings['pocketbook'].append(
+            # Check for transforms
+            if 'transform' in line_hits:
+                pb_warnings.append(
                     f"{file_path} (line {line_num}): CSS transforms may not be supported"
                 )
     
-    def _check_language_attrs(self, content: str, file_path: str):
+    def _check_language_attrs(self, content: bytes, file_path: str):
         """Check for language attribute mismatches in content elements"""
         declared_langs = self.info.get('all_languages', [])
         if not declared_langs:
@@ -571,7 +932,8 @@ class EPUBValidator:
         # Check the html root element's xml:lang
         root_match = self.RE_HTML_ROOT_LANG.search(content)
         if root_match:
-            root_lang = root_match.group(1)
+            # Quotes are ASCII, so the value is whole UTF-8 characters
+            root_lang = root_match.group(1).decode()
             root_primary = root_lang.split('-')[0].lower()
             if root_primary not in declared_primary:
                 self.warnings['general'].append(
@@ -582,8 +944,7 @@ class EPUBValidator:
         # Check for lang attributes on inner elements that mismatch
         # Only flag languages that don't match ANY declared language
         mismatched_langs = {}
-        for match in self.RE_LANG_ATTR.finditer(content):
-            lang_val = match.group(1)
+        for lang_val in map(bytes.decode, self.RE_LANG_ATTR.findall(content)):
             lang_primary = lang_val.split('-')[0].lower()
             # Skip if it matches any declared language
             if lang_primary not in declared_primary:
@@ -601,7 +962,7 @@ class EPUBValidator:
         image_count = 0
         missing_images = set()
         
-        for item_id, item_info in manifest.items():
+        for item_info in self._image_items:
             media_type = item_info['media_type']
             href = item_info['href']
             
@@ -609,8 +970,8 @@ class EPUBValidator:
                 image_count += 1
                 
                 try:
-                    img_data = epub.read(href)
-                    img_size = len(img_data)
+                    # Uncompressed size comes from the central directory - no decompression
+                    img_size = epub.getinfo(href).file_size
                     
                     # Check image size (> 5MB warning)
                     if img_size > 5 * 1024 * 1024:
@@ -624,7 +985,7 @@ class EPUBValidator:
                     
                     # Check image dimensions if possible
                     if media_type in ['image/jpeg', 'image/png']:
-                        width, height = self._get_image_dimensions(img_data, media_type)
+                        width, height = self._read_image_dimensions(epub, href, media_type)
                         if width and height:
                             # Adjust threshold for legitimate high-DPI covers
                             if width > 3000 or height > 4000:
@@ -660,7 +1021,7 @@ class EPUBValidator:
         self.info['image_count'] = image_count
         
         # Check for cover image designation
-        cover_items = [item for item in manifest.values() if 'cover-image' in item.get('properties', '')]
+        cover_items = self._by_property['cover-image']
         
         if len(cover_items) == 0:
             self.warnings['general'].append(
@@ -674,8 +1035,7 @@ class EPUBValidator:
             # Validate cover dimensions
             cover = cover_items[0]
             try:
-                img_data = epub.read(cover['href'])
-                width, height = self._get_image_dimensions(img_data, cover['media_type'])
+                width, height = self._read_image_dimensions(epub, cover['href'], cover['media_type'])
                 if width and height:
                     if width < 300 or height < 400:
                         self.warnings['general'].append(
@@ -689,48 +1049,118 @@ class EPUBValidator:
         if missing_images:
             self._find_image_references(epub, manifest, missing_images)
     
+    def _read_image_head(self, epub: zipfile.ZipFile, href: str, media_type: str) -> bytes:
+        """Read only the leading bytes of an image needed for its dimensions/color space"""
+        if media_type == 'image/png':
+            # IHDR is always at the start of the file
+            return self._read_zip(epub, href, 24)
+        if media_type == 'image/jpeg':
+            # SOF usually sits within the first few KB; stream until it is found
+            data = bytearray()
+            with epub.open(href) as f:
+                while True:
+                    chunk = f.read(65536)
+                    if not chunk:
+                        break
+                    searched = max(0, len(data) - 9)
+                    data += chunk
+                    if self._find_jpeg_sof(data, searched) >= 0:
+                        break
+            return bytes(data)
+        return b''
+
+    def _is_animated_gif(self, epub: zipfile.ZipFile, href: str) -> bool:
+        """Stream a GIF looking for the NETSCAPE looping extension, stopping at the first hit"""
+        tail = b''
+        with epub.open(href) as f:
+            while True:
+                chunk = f.read(65536)
+                if not chunk:
+                    return False
+                # Keep a short overlap so a marker split across chunks is still found
+                window = tail + chunk
+                if b'NETSCAPE2.0' in window or b'NETSCAPE 2.0' in window:
+                    return True
+                tail = window[-11:]
+
+    def _read_image_dimensions(self, epub: zipfile.ZipFile, href: str,
+                               media_type: str) -> Tuple[Optional[int], Optional[int]]:
+        """Read only as much of an image as is needed to get its dimensions"""
+        return self._get_image_dimensions(self._read_image_head(epub, href, media_type), media_type)
+
+    @staticmethod
+    def _find_jpeg_sof(img_data: bytes, start: int = 0) -> int:
+        """Offset of the first complete SOF0/SOF1/SOF2 header in JPEG data, or -1"""
+        # Marker + length + precision + height + width + components = 10 bytes
+        end = max(0, len(img_data) - 8)
+        offsets = [img_data.find(marker, start, end) for marker in (b'\xff\xc0', b'\xff\xc1', b'\xff\xc2')]
+        found = [offset for offset in offsets if offset >= 0]
+        return min(found) if found else -1
+
     def _get_image_dimensions(self, img_data: bytes, media_type: str) -> Tuple[Optional[int], Optional[int]]:
         """Extract image dimensions from JPEG or PNG data"""
         try:
-            if media_type == 'image/png' and len(img_data) > 24:
+            if media_type == 'image/png' and len(img_data) >= 24:
                 # PNG dimensions are at bytes 16-24
-                width, height = struct.unpack('>II', img_data[16:24])
+                width, height = self.STRUCT_PNG_SIZE.unpack_from(img_data, 16)
                 return width, height
             elif media_type == 'image/jpeg':
-                # Basic JPEG dimension extraction
-                i = 0
-                while i < len(img_data) - 9:
-                    if img_data[i] == 0xFF:
-                        if img_data[i+1] in [0xC0, 0xC1, 0xC2]:
-                            height, width = struct.unpack('>HH', img_data[i+5:i+9])
-                            return width, height
-                    i += 1
+                i = self._find_jpeg_sof(img_data)
+                if i >= 0:
+                    height, width = self.STRUCT_JPEG_SIZE.unpack_from(img_data, i + 5)
+                    return width, height
         except struct.error:
             pass
         return None, None
     
     def _find_image_references(self, epub: zipfile.ZipFile, manifest: Dict, missing_images: Set[str]):
         """Find which XHTML files reference missing images"""
-        for item_id, item_info in manifest.items():
-            if item_info['media_type'] in ['application/xhtml+xml', 'text/html']:
-                content = self._read_file_cached(epub, item_info['href'])
-                if content:
-                    for missing_img in missing_images:
-                        img_name = missing_img.split('/')[-1]
-                        if img_name in content or missing_img in content:
-                            self.issues['general'].append(
-                                f"File '{item_info['href']}' references missing image '{missing_img}'"
-                            )
+        # Match the full path and bare file name of every missing image in one
+        # pass; the lookahead lets overlapping names (a.png / ba.png) all match
+        name_to_images: Dict[str, Set[str]] = defaultdict(set)
+        for missing_img in missing_images:
+            name_to_images[missing_img].add(missing_img)
+            name_to_images[missing_img.split('/')[-1]].add(missing_img)
+        names = sorted(name_to_images, key=len, reverse=True)
+        pattern = re.compile('(?=(' + '|'.join(map(re.escape, names)) + '))')
+        # Alternation picks the longest name at each offset, so a hit also
+        # implies every shorter name that is a prefix of it (a.png / a.png.bak);
+        # resolved lazily per distinct hit and memoized across files
+        implied: Dict[str, Set[str]] = {}
+
+        for item_info in self._xhtml_items:
+            content = self._read_file_cached(epub, item_info['href'])
+            if content:
+                referenced = set()
+                for match in pattern.finditer(content):
+                    name = match.group(1)
+                    images = implied.get(name)
+                    if images is None:
+                        images = implied[name] = set().union(*(
+                            name_to_images[name[:k]] for k in range(len(name) + 1)
+                            if name[:k] in name_to_images
+                        ))
+                    referenced.update(images)
+                    if len(referenced) == len(missing_images):
+                        break
+                for missing_img in sorted(referenced):
+                    self.issues['general'].append(
+                        f"File '{item_info['href']}' references missing image '{missing_img}'"
+                    )
     
     def _validate_css(self, epub: zipfile.ZipFile, manifest: Dict):
         """Validate CSS files for platform compatibility"""
-        css_files = [item for item in manifest.values() if item['media_type'] == 'text/css']
+        css_files = self._by_media_type['text/css']
         
         for css_file in css_files:
             href = css_file['href']
             try:
-                with epub.open(href) as f:
-                    content = f.read().decode('utf-8', errors='ignore')
+                # Missing stylesheets raise KeyError here and are reported below
+                epub.getinfo(href)
+                # Read through the shared cache so the KDP stylesheet checks reuse it
+                content = self._read_file_cached(epub, href)
+                if content is None:
+                    continue  # Unsafe path or read error, already reported
                     
                 # Remove comments using pre-compiled pattern
                 clean_content = self.RE_CSS_COMMENT.sub('', content)
@@ -759,32 +1189,15 @@ class EPUBValidator:
 
                 # Check for invalid CSS element selectors (not valid HTML elements)
                 # Only inspect selector portions (text before '{'), not properties inside blocks
-                VALID_HTML_ELEMENTS = {
-                    'a', 'abbr', 'address', 'area', 'article', 'aside', 'audio',
-                    'b', 'base', 'bdi', 'bdo', 'blockquote', 'body', 'br', 'button',
-                    'canvas', 'caption', 'cite', 'code', 'col', 'colgroup',
-                    'data', 'datalist', 'dd', 'del', 'details', 'dfn', 'dialog', 'div', 'dl', 'dt',
-                    'em', 'embed', 'fieldset', 'figcaption', 'figure', 'footer', 'form',
-                    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'head', 'header', 'hgroup', 'hr', 'html',
-                    'i', 'iframe', 'img', 'input', 'ins', 'kbd',
-                    'label', 'legend', 'li', 'link', 'main', 'map', 'mark', 'math', 'menu', 'meta',
-                    'meter', 'nav', 'noscript', 'object', 'ol', 'optgroup', 'option', 'output',
-                    'p', 'param', 'picture', 'pre', 'progress', 'q',
-                    'rp', 'rt', 'ruby', 's', 'samp', 'script', 'search', 'section', 'select', 'slot',
-                    'small', 'source', 'span', 'strong', 'style', 'sub', 'summary', 'sup', 'svg',
-                    'table', 'tbody', 'td', 'template', 'textarea', 'tfoot', 'th', 'thead',
-                    'time', 'title', 'tr', 'track', 'u', 'ul', 'var', 'video', 'wbr',
-                }
                 invalid_selectors = set()
-                bare_element_re = re.compile(r'(?:^|[,\s>+~])([a-zA-Z][a-zA-Z0-9]*)(?=\s*[{,.#:\[>+~ ]|$)')
                 # Split on '{' and inspect only selector parts (text after last '}')
                 for block in clean_content.split('{'):
                     selector_part = block.rsplit('}', 1)[-1].strip()
                     if not selector_part or selector_part.startswith('@'):
                         continue
-                    for match in bare_element_re.finditer(selector_part):
+                    for match in self.RE_CSS_BARE_ELEMENT.finditer(selector_part):
                         candidate = match.group(1).lower()
-                        if candidate not in VALID_HTML_ELEMENTS:
+                        if candidate not in self.VALID_HTML_ELEMENTS:
                             invalid_selectors.add(candidate)
                 for selector in sorted(invalid_selectors):
                     self.warnings['general'].append(
@@ -801,7 +1214,7 @@ class EPUBValidator:
         
         if version.startswith('2'):
             # Check for toc.ncx in EPUB 2
-            ncx_items = [item for item in manifest.values() if item['media_type'] == 'application/x-dtbncx+xml']
+            ncx_items = self._by_media_type['application/x-dtbncx+xml']
             if not ncx_items:
                 self.issues['general'].append(
                     "Missing toc.ncx file (required in EPUB 2.0 - EPUB 2.0.1 \u00a7 2.4.1)"
@@ -809,7 +1222,7 @@ class EPUBValidator:
         
         elif version.startswith('3'):
             # Check for nav document in EPUB 3
-            nav_items = [item for item in manifest.values() if 'nav' in item.get('properties', '')]
+            nav_items = self._by_property['nav']
             if not nav_items:
                 self.issues['general'].append(
                     "Missing navigation document with properties='nav' (required in EPUB 3 - EPUB 3.3 \u00a7 5.4)"
@@ -828,22 +1241,54 @@ class EPUBValidator:
                     f"Spine references non-existent manifest item: '{idref}' (EPUB 3.3 \u00a7 4.3)"
                 )
     
+    def _scan_xhtml_attrs(self, epub: zipfile.ZipFile,
+                          manifest: Dict) -> List[Tuple[str, List[str], List[str], int]]:
+        """Collect id/href attribute values of every content document in one pass
+
+        Returns (href, ids, links, empty_href_count) per document in manifest
+        order. Computed once and shared by _validate_ids and _validate_links.
+        """
+        if self._xhtml_attrs is None:
+            scanned = []
+            # Documents that did not fit the content cache are inflated on the
+            # prefetch workers (zlib releases the GIL); the regex runs here
+            hrefs = [item_info['href'] for item_info in self._xhtml_items]
+            for href, content in self._iter_files_cached(epub, hrefs):
+                if content:
+                    ids = []
+                    links = []
+                    empty_hrefs = 0
+                    # Bytes scan; the text is valid UTF-8 so matches decode strictly
+                    for name, value in self.RE_ID_HREF_ATTR.findall(content.encode('utf-8')):
+                        if name in b'dD':
+                            if value:
+                                ids.append(value.decode())
+                        elif value:
+                            links.append(value.decode())
+                        else:
+                            empty_hrefs += 1
+                    scanned.append((href, ids, links, empty_hrefs))
+            self._xhtml_attrs = scanned
+        return self._xhtml_attrs
+
     def _validate_ids(self, epub: zipfile.ZipFile, manifest: Dict):
         """Validate ID uniqueness across all content documents"""
-        all_ids = defaultdict(list)  # id -> [files using it]
+        first_seen: Dict[str, str] = {}  # id -> first file using it
+        dup_files: Dict[str, List[str]] = {}  # id -> [files using it], duplicates only
         
-        for item_id, item_info in manifest.items():
-            if item_info['media_type'] in ['application/xhtml+xml', 'text/html']:
-                content = self._read_file_cached(epub, item_info['href'])
-                if content:
-                    # Find all id attributes using pre-compiled regex
-                    for match in self.RE_ID_ATTR.finditer(content):
-                        elem_id = match.group(1)
-                        all_ids[elem_id].append(item_info['href'])
+        for href, ids, _, _ in self._scan_xhtml_attrs(epub, manifest):
+            for elem_id in ids:
+                if elem_id in first_seen:
+                    dup_files.setdefault(elem_id, [first_seen[elem_id]]).append(href)
+                else:
+                    first_seen[elem_id] = href
         
-        # Check for duplicates across files
-        for elem_id, files in all_ids.items():
-            if len(files) > 1:
+        if not dup_files:
+            return
+        # Report duplicates in order of first occurrence
+        for elem_id in first_seen:
+            files = dup_files.get(elem_id)
+            if files:
                 self.issues['general'].append(
                     f"Duplicate ID '{elem_id}' found in multiple files: {', '.join(files[:3])}{'...' if len(files) > 3 else ''} (XML 1.0 \u00a7 3.3.1)"
                 )
@@ -853,82 +1298,68 @@ class EPUBValidator:
         # Build set of valid files
         valid_files = {item['href'] for item in manifest.values()}
         
-        # Collect all IDs per file using cached content
+        # Collect all IDs per file from the shared attribute scan
+        scanned = self._scan_xhtml_attrs(epub, manifest)
         file_ids = defaultdict(set)  # file -> set of IDs
-        for item_id, item_info in manifest.items():
-            if item_info['media_type'] in ['application/xhtml+xml', 'text/html']:
-                content = self._read_file_cached(epub, item_info['href'])
-                if content:
-                    for match in self.RE_ID_ATTR.finditer(content):
-                        elem_id = match.group(1)
-                        file_ids[item_info['href']].add(elem_id)
+        for src_href, ids, _, _ in scanned:
+            file_ids[src_href].update(ids)
         
         # Validate links
-        for item_id, item_info in manifest.items():
-            if item_info['media_type'] in ['application/xhtml+xml', 'text/html']:
-                content = self._read_file_cached(epub, item_info['href'])
-                if not content:
-                    continue
-                
-                # Detect empty href attributes (href="" or href='')
-                empty_href_count = len(re.findall(r'href\s*=\s*["\']["\']', content, re.IGNORECASE))
-                if empty_href_count > 0:
-                    self.warnings['general'].append(
-                        f"{item_info['href']}: {empty_href_count} empty href='' attribute(s) (broken or placeholder link)"
-                    )
+        general_issues = self.issues['general']
+        general_warnings = self.warnings['general']
+        for src_href, _, links, empty_href_count in scanned:
+            own_ids = file_ids.get(src_href, set())
+            base_dir = src_href.rpartition('/')[0]
+            
+            # Detect empty href attributes (href="" or href='')
+            if empty_href_count > 0:
+                general_warnings.append(
+                    f"{src_href}: {empty_href_count} empty href='' attribute(s) (broken or placeholder link)"
+                )
 
-                # Find all href attributes using pre-compiled regex
-                for match in self.RE_HREF_ATTR.finditer(content):
-                    href = match.group(1)
+            # Check every href attribute value
+            for href in links:
 
-                    # Skip external links and pure fragments
-                    if href.startswith(('http://', 'https://', 'mailto:', 'ftp://', 'data:')):
-                        continue
-                    if href.startswith('#'):
-                        # Local fragment - validate against current file IDs
-                        fragment = href[1:]
-                        if fragment and fragment not in file_ids.get(item_info['href'], set()):
-                            self.issues['general'].append(
-                                f"{item_info['href']}: Broken link to '#{fragment}' (ID not found in same file)"
-                            )
-                        continue
-                    
-                    # Parse file and fragment
-                    if '#' in href:
-                        file_part, fragment = href.split('#', 1)
-                    else:
-                        file_part, fragment = href, None
+                if href[0] == '#':
+                    # Local fragment - validate against current file IDs
+                    fragment = href[1:]
+                    if fragment and fragment not in own_ids:
+                        general_issues.append(
+                            f"{src_href}: Broken link to '#{fragment}' (ID not found in same file)"
+                        )
+                    continue
+                # Skip external links
+                if href.startswith(self.EXTERNAL_SCHEMES):
+                    continue
+                
+                # Parse file and fragment
+                if '#' in href:
+                    file_part, fragment = href.split('#', 1)
+                else:
+                    file_part, fragment = href, None
+                
+                # Resolve relative path (string join; normalizes ./ and ../)
+                if file_part:
+                    target_file = self._join_zip_path(base_dir, file_part)
                     
-                    # Resolve relative path
-                    if file_part:
-                        base_dir = str(Path(item_info['href']).parent)
-                        if base_dir == '.':
-                            target_file = file_part
-                        else:
-                            target_file = str((Path(base_dir) / file_part).as_posix())
-                        
-                        # Normalize path
-                        target_file = target_file.replace('//', '/')
-                        
-                        if target_file not in valid_files:
-                            self.issues['general'].append(
-                                f"{item_info['href']}: Broken link to '{href}' (file not found in manifest)"
-                            )
-                        elif fragment and fragment not in file_ids.get(target_file, set()):
-                            self.warnings['general'].append(
-                                f"{item_info['href']}: Link to '{href}' - fragment ID '{fragment}' not found in target"
-                            )
-    
+                    if target_file not in valid_files:
+                        general_issues.append(
+                            f"{src_href}: Broken link to '{href}' (file not found in manifest)"
+                        )
+                    elif fragment and fragment not in file_ids.get(target_file, set()):
+                        general_warnings.append(
+                            f"{src_href}: Link to '{href}' - fragment ID '{fragment}' not found in target"
+                        )
+
     def _check_content_structure(self, epub: zipfile.ZipFile, manifest: Dict):
         """Check content file structure for performance and navigation issues"""
         content_files = []
-        for item_id, item_info in manifest.items():
-            if item_info['media_type'] in ('application/xhtml+xml', 'text/html'):
-                try:
-                    info = epub.getinfo(item_info['href'])
-                    content_files.append((item_info['href'], info.file_size))
-                except KeyError:
-                    pass
+        for item_info in self._xhtml_items:
+            try:
+                info = epub.getinfo(item_info['href'])
+                content_files.append((item_info['href'], info.file_size))
+            except KeyError:
+                pass
 
         if not content_files:
             return
@@ -945,34 +1376,18 @@ class EPUBValidator:
 
     def _validate_fonts(self, epub: zipfile.ZipFile, manifest: Dict):
         """Validate embedded fonts"""
-        font_types = [
-            'application/vnd.ms-opentype',
-            'application/x-font-ttf',
-            'application/x-font-truetype',
-            'application/x-font-otf',
-            'font/ttf',
-            'font/otf',
-            'font/woff',
-            'font/woff2'
-        ]
-        
-        font_count = 0
-        
-        for item_id, item_info in manifest.items():
-            media_type = item_info['media_type']
+        # Fonts are collected by media type or extension in _index_manifest
+        for item_info in self._font_items:
             href = item_info['href']
             
-            if media_type in font_types or href.lower().endswith(('.ttf', '.otf', '.woff', '.woff2')):
-                font_count += 1
-                
-                # WOFF/WOFF2 warnings
-                if '.woff' in href.lower():
-                    self.warnings['pocketbook'].append(
-                        f"WOFF font '{href}' may not be supported on all PocketBook models"
-                    )
+            # WOFF/WOFF2 warnings
+            if '.woff' in href.lower():
+                self.warnings['pocketbook'].append(
+                    f"WOFF font '{href}' may not be supported on all PocketBook models"
+                )
         
-        if font_count > 0:
-            self.info['font_count'] = font_count
+        if self._font_items:
+            self.info['font_count'] = len(self._font_items)
     
     def _check_drm(self, epub: zipfile.ZipFile):
         """Check for DRM indicators, distinguishing font obfuscation from actual DRM"""
@@ -982,9 +1397,13 @@ class EPUBValidator:
             'http://ns.adobe.com/pdf/enc#RC',            # Adobe font mangling
         }
 
+        # No encryption file is normal; check the ZIP directory rather than
+        # raising and catching KeyError on the common path
+        if 'META-INF/encryption.xml' not in epub.NameToInfo:
+            return
+
         try:
-            encryption_xml = epub.read('META-INF/encryption.xml').decode('utf-8')
-            enc_root = ET.fromstring(encryption_xml)
+            enc_root = self._parse_xml(self._read_zip(epub, 'META-INF/encryption.xml'))
 
             ns = {
                 'enc': 'http://www.w3.org/2001/04/xmlenc#',
@@ -1019,12 +1438,12 @@ class EPUBValidator:
             self.warnings['general'].append(
                 "Could not parse META-INF/encryption.xml - unable to determine encryption type"
             )
-        except KeyError:
-            pass  # No encryption file is normal
     
     def _check_file_sizes(self, epub: zipfile.ZipFile):
         """Check overall file size"""
-        file_size = self.epub_path.stat().st_size
+        # The archive is already open, so ask its file object rather than stat() the path again
+        epub.fp.seek(0, os.SEEK_END)
+        file_size = epub.fp.tell()
         file_size_mb = file_size / 1024 / 1024
         
         self.info['file_size_mb'] = f"{file_size_mb:.2f}"
@@ -1044,119 +1463,75 @@ class EPUBValidator:
         # PC readers are generally most compatible, so fewer issues
         
         # Check for fixed layout
-        metadata = opf_root.find('.//opf:metadata', self.NAMESPACES)
-        if metadata is not None:
-            for meta in metadata.findall('.//opf:meta', self.NAMESPACES):
-                property_attr = meta.get('property', '')
-                if property_attr == 'rendition:layout' and meta.text == 'pre-paginated':
-                    self.warnings['pc_reader'].append(
-                        "Fixed layout EPUB - may not reflow text properly"
-                    )
+        for meta in self._opf_metas:
+            property_attr = meta.get('property', '')
+            if property_attr == 'rendition:layout' and meta.text == 'pre-paginated':
+                self.warnings['pc_reader'].append(
+                    "Fixed layout EPUB - may not reflow text properly"
+                )
     
     def _check_apple_books_issues(self, opf_root: ET.Element, manifest: Dict):
         """Check for Apple Books specific issues"""
-        # Check for iBooks-specific features
-        metadata = opf_root.find('.//opf:metadata', self.NAMESPACES)
-        if metadata is not None:
-            # Check for interactive widgets
-            for meta in metadata.findall('.//opf:meta', self.NAMESPACES):
-                property_attr = meta.get('property', '')
-                if 'ibooks:' in property_attr:
-                    self.warnings['apple_books'].append(
-                        f"iBooks-specific feature detected: {property_attr} (not portable to other readers)"
-                    )
-        
-        # Check for Apple-specific media
-        for item_id, item_info in manifest.items():
-            media_type = item_info['media_type']
-            properties = item_info['properties']
-            
-            if 'scripted' in properties:
+        # Check for iBooks-specific features (e.g. interactive widgets)
+        for meta in self._opf_metas:
+            property_attr = meta.get('property', '')
+            if 'ibooks:' in property_attr:
                 self.warnings['apple_books'].append(
-                    f"Scripted content in '{item_info['href']}' - Apple Books specific"
+                    f"iBooks-specific feature detected: {property_attr} (not portable to other readers)"
                 )
+        
+        # Check for Apple-specific media
+        for item_info in self._by_property['scripted']:
+            self.warnings['apple_books'].append(
+                f"Scripted content in '{item_info['href']}' - Apple Books specific"
+            )
     
     def _check_pocketbook_issues(self, opf_root: ET.Element, manifest: Dict):
         """Check for PocketBook specific issues"""
         # PocketBook has good EPUB support but some limitations
-        
-        # Check for complex CSS
-        for item_id, item_info in manifest.items():
-            if item_info['media_type'] == 'text/css':
-                # Already handled in CSS validation
-                pass
+        # (complex CSS is already handled in CSS validation)
         
         # Check for MathML
-        for item_id, item_info in manifest.items():
-            media_type = item_info['media_type']
-            if media_type in ['application/xhtml+xml', 'text/html']:
-                # Would need to parse content for MathML - simplified check
-                properties = item_info['properties']
-                if 'mathml' in properties.lower():
-                    self.warnings['pocketbook'].append(
-                        f"MathML content may have limited support on PocketBook"
-                    )
+        for item_info in self._xhtml_items:
+            # Would need to parse content for MathML - simplified check
+            if 'mathml' in item_info['properties_set']:
+                self.warnings['pocketbook'].append(
+                    f"MathML content may have limited support on PocketBook"
+                )
     
     def _check_kobo_issues(self, opf_root: ET.Element, manifest: Dict):
         """Check for Kobo specific issues"""
         # Kobo has good EPUB support, similar to PC readers but with some quirks
         
         # Check for Kobo-specific enhancements (optional)
-        metadata = opf_root.find('.//opf:metadata', self.NAMESPACES)
-        if metadata is not None:
-            for meta in metadata.findall('.//opf:meta', self.NAMESPACES):
-                property_attr = meta.get('property', '')
-                if 'kobo:' in property_attr:
-                    self.warnings['kobo'].append(
-                        f"Kobo-specific feature detected: {property_attr} (not portable to other readers)"
-                    )
-        
-        # Check for large images (Kobo can be slower with large images)
-        for item_id, item_info in manifest.items():
-            media_type = item_info['media_type']
-            if media_type in ['image/jpeg', 'image/png']:
-                # Already checked in general validation
-                pass
+        for meta in self._opf_metas:
+            property_attr = meta.get('property', '')
+            if 'kobo:' in property_attr:
+                self.warnings['kobo'].append(
+                    f"Kobo-specific feature detected: {property_attr} (not portable to other readers)"
+                )
         
-        # Kobo handles most CSS well, but check for some edge cases
-        for item_id, item_info in manifest.items():
-            if item_info['media_type'] == 'text/css':
-                href = item_info['href']
-                # Most CSS works fine on Kobo, only warn about very advanced features
-                # (Already covered in general CSS validation)
-                pass
+        # Large images (Kobo can be slower with them) are checked in general
+        # validation, and the few CSS edge cases Kobo has in CSS validation
     
     def _check_inkbook_issues(self, opf_root: ET.Element, manifest: Dict):
         """Check for InkBook specific issues"""
         # InkBook (Polish e-reader) has similar limitations to PocketBook
-        
-        # InkBook has issues with CSS transforms similar to PocketBook
-        for item_id, item_info in manifest.items():
-            if item_info['media_type'] == 'text/css':
-                href = item_info['href']
-                # CSS transform issues are already detected in PocketBook checks
-                # and CSS validation, so we reference those
-                pass
+        # (its CSS transform issues are already detected in CSS validation)
         
         # Check for SVG support (limited)
-        for item_id, item_info in manifest.items():
-            media_type = item_info['media_type']
-            href = item_info['href']
-            
-            if media_type == 'image/svg+xml':
-                self.warnings['inkbook'].append(
-                    f"SVG image '{href}' may have limited support on InkBook"
-                )
+        for item_info in self._by_media_type['image/svg+xml']:
+            self.warnings['inkbook'].append(
+                f"SVG image '{item_info['href']}' may have limited support on InkBook"
+            )
         
         # Check for fixed layout (pre-paginated only)
-        metadata = opf_root.find('.//opf:metadata', self.NAMESPACES)
-        if metadata is not None:
-            for meta in metadata.findall('.//opf:meta', self.NAMESPACES):
-                property_attr = meta.get('property', '')
-                if property_attr == 'rendition:layout' and meta.text and meta.text.strip() == 'pre-paginated':
-                    self.warnings['inkbook'].append(
-                        "Fixed layout may not work correctly on InkBook"
-                    )
+        for meta in self._opf_metas:
+            property_attr = meta.get('property', '')
+            if property_attr == 'rendition:layout' and meta.text and meta.text.strip() == 'pre-paginated':
+                self.warnings['inkbook'].append(
+                    "Fixed layout may not work correctly on InkBook"
+                )
     
     def _check_android_issues(self, opf_root: ET.Element, manifest: Dict):
         """Check for Android default EPUB reader issues"""
@@ -1164,20 +1539,16 @@ class EPUBValidator:
         # Most modern Android readers have good EPUB 3 support
         
         # Check for audio/video (Google Play Books supports, others may not)
-        media_types = ['audio/mpeg', 'audio/mp4', 'video/mp4', 'video/h264']
-        for item_id, item_info in manifest.items():
-            if item_info['media_type'] in media_types:
-                self.warnings['android'].append(
-                    f"Audio/Video content '{item_info['href']}' - support varies by Android reader app"
-                )
+        for item_info in self._av_items:
+            self.warnings['android'].append(
+                f"Audio/Video content '{item_info['href']}' - support varies by Android reader app"
+            )
         
         # Check for MathML (limited support)
-        for item_id, item_info in manifest.items():
-            properties = item_info.get('properties', '')
-            if 'mathml' in properties.lower():
-                self.warnings['android'].append(
-                    "MathML content may not display correctly in all Android EPUB readers"
-                )
+        for item_info in self._by_property['mathml']:
+            self.warnings['android'].append(
+                "MathML content may not display correctly in all Android EPUB readers"
+            )
         
         # JavaScript warnings (very limited support)
         # Already covered in general checks
@@ -1201,29 +1572,21 @@ class EPUBValidator:
 
     def _is_cmyk_jpeg(self, img_data: bytes) -> bool:
         """Check if JPEG uses CMYK color space by examining SOF marker"""
-        i = 0
-        while i < len(img_data) - 9:
-            if img_data[i] == 0xFF and img_data[i + 1] in (0xC0, 0xC1, 0xC2):
-                num_components = img_data[i + 9]
-                return num_components == 4
-            i += 1
-        return False
+        i = self._find_jpeg_sof(img_data)
+        return i >= 0 and img_data[i + 9] == 4
 
     def _kdp_check_cover_image(self, epub: zipfile.ZipFile, manifest: Dict, opf_root: ET.Element):
         """Check cover image requirements for Amazon KDP"""
-        cover_items = [item for item in manifest.values()
-                       if 'cover-image' in item.get('properties', '')]
+        cover_items = self._by_property['cover-image']
 
         # Also check EPUB2 meta name="cover"
         if not cover_items:
-            metadata = opf_root.find('.//opf:metadata', self.NAMESPACES)
-            if metadata is not None:
-                for meta in metadata.findall('.//opf:meta', self.NAMESPACES):
-                    if meta.get('name') == 'cover':
-                        cover_id = meta.get('content')
-                        if cover_id and cover_id in manifest:
-                            cover_items = [manifest[cover_id]]
-                            break
+            for meta in self._opf_metas:
+                if meta.get('name') == 'cover':
+                    cover_id = meta.get('content')
+                    if cover_id and cover_id in manifest:
+                        cover_items = [manifest[cover_id]]
+                        break
 
         if not cover_items:
             self.issues['kindle'].append(
@@ -1240,7 +1603,7 @@ class EPUBValidator:
             )
 
         try:
-            img_data = epub.read(cover['href'])
+            img_data = self._read_image_head(epub, cover['href'], cover['media_type'])
             width, height = self._get_image_dimensions(img_data, cover['media_type'])
             if width and height:
                 # Minimum dimensions
@@ -1300,18 +1663,17 @@ class EPUBValidator:
     def _kdp_check_file_limits(self, epub: zipfile.ZipFile, manifest: Dict):
         """Check KDP file count and size limits"""
         html_count = 0
-        for item_id, item_info in manifest.items():
-            if item_info['media_type'] in ('application/xhtml+xml', 'text/html'):
-                html_count += 1
-                try:
-                    info = epub.getinfo(item_info['href'])
-                    size_mb = info.file_size / (1024 * 1024)
-                    if size_mb > 30:
-                        self.issues['kindle'].append(
-                            f"HTML file '{item_info['href']}' ({size_mb:.1f}MB) exceeds KDP 30MB per-file limit"
-                        )
-                except KeyError:
-                    pass
+        for item_info in self._xhtml_items:
+            html_count += 1
+            try:
+                info = epub.getinfo(item_info['href'])
+                size_mb = info.file_size / (1024 * 1024)
+                if size_mb > 30:
+                    self.issues['kindle'].append(
+                        f"HTML file '{item_info['href']}' ({size_mb:.1f}MB) exceeds KDP 30MB per-file limit"
+                    )
+            except KeyError:
+                pass
 
         if html_count > 300:
             self.issues['kindle'].append(
@@ -1325,19 +1687,13 @@ class EPUBValidator:
         nav_href = None
 
         # Find nav document (EPUB3) or NCX (EPUB2)
-        if version.startswith('3'):
-            for item_id, item_info in manifest.items():
-                if 'nav' in item_info.get('properties', ''):
-                    nav_href = item_info['href']
-                    nav_content = self._read_file_cached(epub, nav_href)
-                    break
+        if version.startswith('3') and self._by_property['nav']:
+            nav_href = self._by_property['nav'][0]['href']
+            nav_content = self._read_file_cached(epub, nav_href)
 
-        if nav_content is None:
-            for item_id, item_info in manifest.items():
-                if item_info['media_type'] == 'application/x-dtbncx+xml':
-                    nav_href = item_info['href']
-                    nav_content = self._read_file_cached(epub, nav_href)
-                    break
+        if nav_content is None and self._by_media_type['application/x-dtbncx+xml']:
+            nav_href = self._by_media_type['application/x-dtbncx+xml'][0]['href']
+            nav_content = self._read_file_cached(epub, nav_href)
 
         if nav_content is None:
             self.issues['kindle'].append(
@@ -1352,10 +1708,7 @@ class EPUBValidator:
             )
 
         # Check for page numbers in TOC (common in print conversions)
-        page_pattern = re.compile(
-            r'>\s*.*?\.\s*\.\s*\.\s*\d+\s*<|>\s*page\s+\d+\s*<', re.IGNORECASE
-        )
-        if page_pattern.search(nav_content):
+        if self.RE_TOC_PAGE_NUMBER.search(nav_content):
             self.warnings['kindle'].append(
                 f"TOC contains page numbers ({nav_href}) - remove for KDP "
                 f"(reflowable content has no fixed pages)"
@@ -1370,7 +1723,7 @@ class EPUBValidator:
                 )
         elif version.startswith('2'):
             guide = opf_root.find('.//opf:guide', self.NAMESPACES)
-            if guide is None or len(guide.findall('.//opf:reference', self.NAMESPACES)) == 0:
+            if guide is None or len(guide.findall('opf:reference', self.NAMESPACES)) == 0:
                 self.warnings['kindle'].append(
                     "No <guide> element in OPF - adding guide references helps KDP build navigation"
                 )
@@ -1378,17 +1731,12 @@ class EPUBValidator:
     def _kdp_check_unsupported_html(self, epub: zipfile.ZipFile, manifest: Dict):
         """Check for HTML elements not supported by Amazon KDP"""
         # Check manifest for unsupported media types
-        media_types_unsupported = ('audio/mpeg', 'audio/mp4', 'video/mp4', 'video/h264')
-        for item_id, item_info in manifest.items():
-            if item_info['media_type'] in media_types_unsupported:
-                self.issues['kindle'].append(
-                    f"Audio/video content '{item_info['href']}' not supported on KDP"
-                )
-
-        for item_id, item_info in manifest.items():
-            if item_info['media_type'] not in ('application/xhtml+xml', 'text/html'):
-                continue
+        for item_info in self._av_items:
+            self.issues['kindle'].append(
+                f"Audio/video content '{item_info['href']}' not supported on KDP"
+            )
 
+        for item_info in self._xhtml_items:
             content = self._read_file_cached(epub, item_info['href'])
             if not content:
                 continue
@@ -1422,14 +1770,14 @@ class EPUBValidator:
                 )
 
             # MathML
-            if 'mathml' in item_info.get('properties', '').lower() or '<math' in content_clean.lower():
+            if 'mathml' in item_info['properties_set'] or '<math' in content_clean.lower():
                 self.issues['kindle'].append(
                     f"MathML content in '{href}' - not supported by KDP Enhanced Typesetting"
                 )
 
     def _kdp_check_css_restrictions(self, epub: zipfile.ZipFile, manifest: Dict):
         """Check CSS restrictions for Amazon KDP"""
-        css_files = [item for item in manifest.values() if item['media_type'] == 'text/css']
+        css_files = self._by_media_type['text/css']
 
         for css_file in css_files:
             href = css_file['href']
@@ -1477,36 +1825,35 @@ class EPUBValidator:
 
     def _kdp_check_enhanced_typesetting(self, epub: zipfile.ZipFile, manifest: Dict):
         """Check for patterns that break Amazon KDP Enhanced Typesetting"""
-        for item_id, item_info in manifest.items():
-            if item_info['media_type'] not in ('application/xhtml+xml', 'text/html'):
-                continue
-
+        for item_info in self._xhtml_items:
             content = self._read_file_cached(epub, item_info['href'])
             if not content:
                 continue
 
             href = item_info['href']
+            raw = content.encode('utf-8')
 
             # Base64-encoded images
-            if self.RE_BASE64_IMAGE.search(content):
+            if self.RE_BASE64_IMAGE.search(raw):
                 self.warnings['kindle'].append(
                     f"Base64-encoded image in '{href}' - disables Enhanced Typesetting; use external image files"
                 )
 
             # SVG with namespace prefixes (e.g., svg:rect instead of rect)
-            if 'svg:' in content.lower() and '<svg' in content.lower():
+            lowered = content.lower()
+            if 'svg:' in lowered and '<svg' in lowered:
                 self.warnings['kindle'].append(
                     f"SVG namespace prefixes in '{href}' - may break KDP rendering; use default namespace"
                 )
 
             # Float inside table cells (inline styles)
-            if re.search(r'<t[dh][^>]*style=[^>]*float\s*:', content, re.IGNORECASE):
+            if self.RE_TABLE_CELL_FLOAT.search(raw):
                 self.warnings['kindle'].append(
                     f"Float in table cells in '{href}' - breaks Enhanced Typesetting"
                 )
 
         # Check CSS for enhanced typesetting breakers
-        css_files = [item for item in manifest.values() if item['media_type'] == 'text/css']
+        css_files = self._by_media_type['text/css']
         for css_file in css_files:
             href = css_file['href']
             content = self._read_file_cached(epub, href)
@@ -1529,7 +1876,7 @@ class EPUBValidator:
 
     def _kdp_check_image_requirements(self, epub: zipfile.ZipFile, manifest: Dict):
         """Check image requirements for Amazon KDP"""
-        for item_id, item_info in manifest.items():
+        for item_info in self._image_items:
             media_type = item_info['media_type']
             href = item_info['href']
 
@@ -1542,8 +1889,7 @@ class EPUBValidator:
             # Animated GIF detection
             if media_type == 'image/gif':
                 try:
-                    gif_data = epub.read(href)
-                    if b'NETSCAPE2.0' in gif_data or b'NETSCAPE 2.0' in gif_data:
+                    if self._is_animated_gif(epub, href):
                         self.warnings['kindle'].append(
                             f"Animated GIF '{href}' - KDP displays only first frame"
                         )
@@ -1553,12 +1899,10 @@ class EPUBValidator:
             # CMYK detection for all JPEG images (not just cover)
             if media_type == 'image/jpeg':
                 try:
-                    img_data = epub.read(href)
+                    img_data = self._read_image_head(epub, href, media_type)
                     if self._is_cmyk_jpeg(img_data):
                         # Skip cover image (already checked in _kdp_check_cover_image)
-                        cover_items = [item for item in manifest.values()
-                                       if 'cover-image' in item.get('properties', '')]
-                        is_cover = any(c['href'] == href for c in cover_items)
+                        is_cover = any(c['href'] == href for c in self._by_property['cover-image'])
                         if not is_cover:
                             self.warnings['kindle'].append(
                                 f"Image '{href}' uses CMYK color space - "
@@ -1569,9 +1913,7 @@ class EPUBValidator:
 
         # Check alt text on images in HTML content
         missing_alt_count = 0
-        for item_id, item_info in manifest.items():
-            if item_info['media_type'] not in ('application/xhtml+xml', 'text/html'):
-                continue
+        for item_info in self._xhtml_items:
             content = self._read_file_cached(epub, item_info['href'])
             if not content:
                 continue
@@ -1587,7 +1929,7 @@ class EPUBValidator:
 
     def _kdp_check_font_rules(self, manifest: Dict):
         """Check font requirements for Amazon KDP"""
-        for item_id, item_info in manifest.items():
+        for item_info in self._font_items:
             href = item_info['href']
             if href.lower().endswith('.woff') or item_info['media_type'] == 'font/woff':
                 self.issues['kindle'].append(
@@ -1602,10 +1944,7 @@ class EPUBValidator:
         """Check content quality issues for Amazon KDP"""
         excessive_nbsp_files = []
 
-        for item_id, item_info in manifest.items():
-            if item_info['media_type'] not in ('application/xhtml+xml', 'text/html'):
-                continue
-
+        for item_info in self._xhtml_items:
             content = self._read_file_cached(epub, item_info['href'])
             if not content:
                 continue
@@ -1623,7 +1962,7 @@ class EPUBValidator:
             )
 
         # Check CSS for body-level bold/italic and forced colors
-        css_files = [item for item in manifest.values() if item['media_type'] == 'text/css']
+        css_files = self._by_media_type['text/css']
         color_file_count = 0
         for css_file in css_files:
             content = self._read_file_cached(epub, css_file['href'])
@@ -1653,6 +1992,12 @@ class EPUBValidator:
 
     def _generate_report(self) -> Dict:
         """Generate final validation report"""
+        # Collapse repeated identical messages (e.g. one per manifest item), keeping first-seen order
+        for messages in (self.issues, self.warnings):
+            for category, entries in messages.items():
+                if len(entries) > 1:
+                    messages[category] = list(dict.fromkeys(entries))
+        
         # Generate critical issues summary
         critical_summary = self._generate_critical_summary()
         
@@ -1672,23 +2017,34 @@ class EPUBValidator:
             'general': []
         }
         
+        # Each bucket is scanned once, lower-casing every message only once
+        
         # Check for Apple Books blockers
-        apple_issues = self.issues['apple_books']
-        if any('entity' in issue.lower() for issue in apple_issues):
+        has_entity = has_xml_parsing = False
+        for issue in self.issues['apple_books']:
+            low = issue.lower()
+            if 'entity' in low:
+                has_entity = True
+            if 'xml parsing' in low:
+                has_xml_parsing = True
+        if has_entity:
             summary['apple_books'].append("HTML entity errors prevent full rendering")
-        if any('xml parsing' in issue.lower() for issue in apple_issues):
+        if has_xml_parsing:
             summary['apple_books'].append("XML parsing errors stop content display")
         
         # Check for PocketBook blockers
-        pb_issues = self.issues['pocketbook']
-        transform_count = len([i for i in pb_issues if 'CSS transform' in i and 'text-transform' not in i])
+        transform_count = margin_count = 0
+        for issue in self.issues['pocketbook']:
+            if 'CSS transform' in issue and 'text-transform' not in issue:
+                transform_count += 1
+            if 'Large margin' in issue:
+                margin_count += 1
         if transform_count > 0:
             summary['pocketbook'].append(
                 f"CSS transforms ({transform_count} found) STOP rendering after ~20 pages"
             )
         
         # Check for large margin issues
-        margin_count = len([i for i in pb_issues if 'Large margin' in i])
         if margin_count > 0:
             summary['pocketbook'].append(
                 f"Large margin values ({margin_count} found) cause mixed/unreadable text layout"
@@ -1701,24 +2057,35 @@ class EPUBValidator:
             pass
 
         # Check for KDP blockers
-        kindle_issues = self.issues['kindle']
-        if any('cover' in i.lower() and ('requires' in i.lower() or 'too small' in i.lower()
-               or 'not accepted' in i.lower()) for i in kindle_issues):
+        has_cover = has_identifier = has_toc = False
+        unsupported_count = 0
+        for issue in self.issues['kindle']:
+            low = issue.lower()
+            if 'cover' in low and ('requires' in low or 'too small' in low or 'not accepted' in low):
+                has_cover = True
+            if 'dc:identifier' in low:
+                has_identifier = True
+            if 'table of contents' in low:
+                has_toc = True
+            if 'unsupported' in low or 'not supported' in low:
+                unsupported_count += 1
+        if has_cover:
             summary['kindle'].append("Cover image issues may prevent KDP publishing")
-        if any('dc:identifier' in i.lower() for i in kindle_issues):
+        if has_identifier:
             summary['kindle'].append("Missing required dc:identifier metadata")
-        if any('table of contents' in i.lower() for i in kindle_issues):
+        if has_toc:
             summary['kindle'].append("Missing table of contents required by KDP")
-        unsupported = [i for i in kindle_issues
-                       if 'unsupported' in i.lower() or 'not supported' in i.lower()]
-        if unsupported:
+        if unsupported_count:
             summary['kindle'].append(
-                f"Unsupported content ({len(unsupported)} issues) may be stripped or cause rejection"
+                f"Unsupported content ({unsupported_count} issues) may be stripped or cause rejection"
             )
 
         # Check for general critical issues
-        gen_issues = self.issues['general']
-        entity_count = len([i for i in gen_issues if 'entity' in i.lower() and 'nbsp' in i.lower()])
+        entity_count = 0
+        for issue in self.issues['general']:
+            low = issue.lower()
+            if 'entity' in low and 'nbsp' in low:
+                entity_count += 1
         if entity_count > 0:
             summary['general'].append(f"HTML entity errors ({entity_count}) affect all readers")
         
@@ -2030,9 +2397,8 @@ def _print_calibre_guide(report: Dict, log):
 def print_report(report: Dict, output_file=None):
     """Pretty print the validation report and optionally save to file"""
     
-    # Capture output to a string buffer first
-    import io
-    output = io.StringIO()
+    # Collect the lines and write the finished report once (stdout and file)
+    lines: List[str] = []
     
     # Track which explanations have been shown
     shown_explanations = set()
@@ -2078,19 +2444,27 @@ def print_report(report: Dict, output_file=None):
         r"single file|Single file|splitting into chapters": "Note: Splitting content into separate chapter files improves reader memory usage, navigation, and bookmarking.",
         r"CMYK color space": "Reference: Amazon KDP and most e-readers expect sRGB color space. CMYK images may display with shifted colors after conversion."
     }
+    # One combined search rejects messages no explanation applies to; the rest
+    # test the precompiled patterns in order, skipping those already shown
+    explanation_patterns = [
+        (pattern, re.compile(pattern, re.IGNORECASE), explanation)
+        for pattern, explanation in EXPLANATIONS.items()
+    ]
+    any_explanation = re.compile('|'.join(f'(?:{pattern})' for pattern in EXPLANATIONS), re.IGNORECASE)
     
     def log(msg=""):
-        print(msg)
-        output.write(msg + "\n")
+        lines.append(msg)
 
     def check_explanation(message):
-        for pattern, explanation in EXPLANATIONS.items():
-            if re.search(pattern, message, re.IGNORECASE) and pattern not in shown_explanations:
+        if not any_explanation.search(message):
+            return
+        for pattern, regex, explanation in explanation_patterns:
+            if pattern not in shown_explanations and regex.search(message):
                 shown_explanations.add(pattern)
                 log(f"     [INFO] {explanation}")
 
     if not report:
-        log("No report generated.")
+        print("No report generated.")
         return
 
     log("\n" + "="*70)
@@ -2212,10 +2586,13 @@ def print_report(report: Dict, output_file=None):
     log("="*70 + "\n")
 
     # Save to file if requested
+    text = "\n".join(lines) + "\n"
+    sys.stdout.write(text)
+
     if output_file:
         try:
             with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(output.getvalue())
+                f.write(text)
             print(f"\n[SUCCESS] Report saved to: {output_file}")
         except Exception as e:
             print(f"\n[ERROR] Could not save report: {e}")